@@ -287,7 +287,10 @@ CELERY_REDIS_BACKEND_USE_SSL = (
     {"ssl_cert_reqs": ssl.CERT_NONE} if CELERY_RESULT_BACKEND.startswith("rediss://") else None
 )
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#result-extended
-CELERY_RESULT_EXTENDED = True
+CELERY_RESULT_EXTENDED = False
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#result-expires
+# No más que TASK_META_CACHE_TTL (podcast_app/constants.py)
+CELERY_RESULT_EXPIRES = 15 * 60
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#result-backend-always-retry
 # https://github.com/celery/celery/pull/6122
 CELERY_RESULT_BACKEND_ALWAYS_RETRY = True
@@ -299,6 +302,8 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#std:setting-result_serializer
 CELERY_RESULT_SERIALIZER = "json"
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#task-track-started
+CELERY_TASK_TRACK_STARTED = True
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#task-time-limit
 # TODO: set to whatever value is adequate in your circumstances
 CELERY_TASK_TIME_LIMIT = 5 * 60
@@ -340,3 +345,9 @@ STATICFILES_FINDERS += ["compressor.finders.CompressorFinder"]
 
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Segundos que TaskStatusView espera a que termine la tarea (long polling);
+# 0 responde al momento, el stream SSE tampoco se queda abierto y el
+# frontend vuelve al polling cada 5 s. Solo con workers con hilos (gunicorn gthread, ver
+# compose/production/django/start): con workers sync cada espera bloquea
+# el worker entero y con él todo el sitio.
+TASK_STATUS_LONG_POLL_TIMEOUT = env.int("DJANGO_TASK_STATUS_LONG_POLL_TIMEOUT", default=0)
@@ -221,3 +221,6 @@ sentry_sdk.init(
 
 # Your stuff...
 # ------------------------------------------------------------------------------
+# gunicorn corre con workers gthread: el long polling ocupa un hilo, no el worker.
+# Por debajo del timeout de gunicorn.
+TASK_STATUS_LONG_POLL_TIMEOUT = env.int("DJANGO_TASK_STATUS_LONG_POLL_TIMEOUT", default=20)
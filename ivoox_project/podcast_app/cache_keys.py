@@ -0,0 +1,70 @@
+"""
+Claves de caché de la app.
+
+Todas las claves siguen el esquema ``{dominio}:{hash}``: el valor de origen
+(una búsqueda o una URL de iVoox) se resume con BLAKE2b, así la clave tiene
+siempre la misma longitud y nunca contiene caracteres que el backend rechace.
+
+Dominios (el TTL de cada uno está en constants.py):
+
+- ``search:{hash}``: podcasts encontrados para una búsqueda (SEARCH_CACHE_TTL).
+- ``episodes:{hash}``: MP3 de un podcast, por URL normalizada (EPISODES_CACHE_TTL).
+- ``lock:{clave}``: task_id de la tarea que está rellenando ``{clave}``
+  (TASK_LOCK_TTL, o FAILED_TASK_LOCK_TTL si la tarea falla).
+- ``fresh:{clave}``: marca de frescura de ``{clave}``; caduca
+  REFRESH_AHEAD_WINDOW antes que el dato para refrescarlo por adelantado.
+- ``taskmeta:{task_id}``: respuesta de estado de una tarea ya terminada
+  (TASK_META_CACHE_TTL).
+"""
+
+import functools
+import hashlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+def make_key(prefix, value):
+    digest = hashlib.blake2b(value.encode(), digest_size=16).hexdigest()
+    return f"{prefix}:{digest}"
+
+
+def normalize_query(query):
+    """Minúsculas y espacios colapsados: 'Foo  Bar ' y 'foo bar' son la misma búsqueda."""
+    return " ".join(query.lower().split())
+
+
+# search_key y episodes_key se memorizan por proceso: las búsquedas y URLs
+# más pedidas no vuelven a normalizarse ni a hashearse en cada petición.
+@functools.lru_cache(maxsize=4096)
+def search_key(query):
+    return make_key("search", normalize_query(query))
+
+
+def normalize_podcast_url(podcast_url):
+    """
+    Esquema y host en minúsculas, sin barra final, sin parámetros utm_*
+    ni fragmento: las variantes de una misma URL comparten entrada de caché.
+    """
+    parts = urlsplit(podcast_url.strip())
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    query = urlencode([(name, value) for name, value in params if not name.startswith("utm_")])
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), query, ""))
+
+
+@functools.lru_cache(maxsize=4096)
+def episodes_key(podcast_url):
+    return make_key("episodes", normalize_podcast_url(podcast_url))
+
+
+def task_lock_key(cache_key):
+    """Guarda el task_id de la tarea que está rellenando ``cache_key``."""
+    return f"lock:{cache_key}"
+
+
+def fresh_key(cache_key):
+    """Existe mientras ``cache_key`` no necesite refrescarse."""
+    return f"fresh:{cache_key}"
+
+
+def task_meta_key(task_id):
+    """Guarda la respuesta de estado de una tarea que ya ha terminado."""
+    return f"taskmeta:{task_id}"
@@ -1,2 +1,22 @@
 CACHE_TTL_24H = 60 * 60 * 24
 CACHE_TTL_1M = 60 * 60 * 24 * 30
+CACHE_TTL_15MIN = 60 * 15
+CACHE_TTL_10MIN = 60 * 10
+CACHE_TTL_1MIN = 60
+
+# TTL por dominio de caché (ver cache_keys.py para el esquema de claves).
+# Los resultados de búsqueda apenas cambian; los listados de episodios
+# crecen con cada episodio nuevo, así que caducan antes.
+SEARCH_CACHE_TTL = CACHE_TTL_1M
+EPISODES_CACHE_TTL = CACHE_TTL_24H
+# Reserva de la tarea en curso: cubre de sobra un scraping completo
+TASK_LOCK_TTL = CACHE_TTL_10MIN
+# Tras un fallo, la reserva se mantiene este tiempo para no relanzar en bucle
+FAILED_TASK_LOCK_TTL = CACHE_TTL_1MIN
+# En la última hora de vida de un dato, la primera lectura lanza su refresco
+REFRESH_AHEAD_WINDOW = 60 * 60
+# Estado final (SUCCESS/FAILURE) de una tarea ya consultada: los siguientes
+# polls se sirven desde la caché sin volver al backend de Celery. La tarea
+# se olvida en el backend al leerla, así que debe durar al menos lo que
+# habría durado su resultado (CELERY_RESULT_EXPIRES).
+TASK_META_CACHE_TTL = CACHE_TTL_15MIN
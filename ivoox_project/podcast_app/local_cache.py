@@ -0,0 +1,42 @@
+"""
+Caché L1 en memoria de cada proceso web, delante de la caché de Django (L2, Redis).
+
+Las mismas búsquedas y listados se piden muchas veces seguidas; servirlos
+desde un dict del proceso evita la ida y vuelta a Redis. El TTL es corto
+porque cada proceso tiene su copia y no se entera de las escrituras de
+los demás: como mucho sirve un dato ``ttl`` segundos más antiguo que Redis.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class LocalTTLCache:
+    """LRU de como mucho ``maxsize`` entradas que caducan a los ``ttl`` segundos."""
+
+    def __init__(self, maxsize=1024, ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        # gunicorn puede servir peticiones en varios hilos (worker gthread)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-15 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('podcast_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='favoritepodcast',
+            index=models.Index(fields=['user', '-created_at'], name='fav_user_created_idx'),
+        ),
+    ]
@@ -26,6 +26,10 @@ class FavoritePodcast(models.Model):
         # Un usuario no puede tener el mismo podcast dos veces
         unique_together = ("user", "ivoox_id")
         ordering = ["-created_at"]
+        # La lista de favoritos filtra por usuario y ordena por fecha
+        indexes = [
+            models.Index(fields=["user", "-created_at"], name="fav_user_created_idx"),
+        ]
 
     def __str__(self):
         return f"'{self.name}' (Favorito de {self.user.email})"
@@ -1,17 +1,21 @@
 import logging
 import re
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from typing import Any
-from urllib.parse import urljoin
 
 import requests
-from lxml import html
+from lxml import etree, html
+from requests.adapters import HTTPAdapter
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Podcast:
     """Represents a podcast with its metadata."""
 
@@ -29,7 +33,7 @@ class Podcast:
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Episode:
     """Represents an episode with its metadata."""
 
@@ -56,18 +60,63 @@ class Episode:
 class IvooxAPI:
     """Client for scraping podcast data from Ivoox."""
 
-    BASE_URL = "http://www.ivoox.com"
+    BASE_URL = "https://www.ivoox.com"
     REQUEST_TIMEOUT = 10
     PODCAST_ID_PATTERN = re.compile(r"_sq_(.*?)_1\.html")
+    AUDIO_REF_PATTERN = re.compile(r"_rf_(\d+_\d+)\.html")
+    MEDIA_URL_PATTERN = re.compile(r'mediaUrl["\s:]+([^"\']+\.mp3)')
+    PAGE_SUFFIX_PATTERN = re.compile(r"_\d+\.html$")
+    AUDIO_URL_ERROR = "Error: No se pudo extraer el número de referencia de la URL proporcionada."
+    # Número de páginas que se piden en paralelo al recorrer un listado
+    PAGE_BATCH_SIZE = 8
+
+    # Expresiones XPath compiladas una sola vez; cada llamada solo las evalúa
+    PODCAST_NODES_XPATH = etree.XPath("//div[@class='front modulo-view modulo-type-programa']")
+    EPISODE_NODES_XPATH = etree.XPath("//div[@class='front modulo-view modulo-type-episodio']")
+    MP3_LINKS_XPATH = etree.XPath(
+        "//a[contains(@href, 'mp3_rf_') and contains(@class, 'font-size-14 font-size-md-16')]",
+    )
+    MP3_THUMBNAILS_XPATH = etree.XPath(
+        "//img[contains(@src, 'img-static.ivoox.com') and contains(@class, 'img-hover img-rounded')]",
+    )
+    PODCAST_TITLE_XPATH = etree.XPath("//*[@id='list_title_new']")
+    MEDIA_URL_SCRIPTS_XPATH = etree.XPath("//script[contains(text(), 'mediaUrl')]")
+    MEDIA_ATTR_XPATHS = {
+        attr: etree.XPath(f"//button[@{attr}] | //*[@{attr}]")
+        for attr in ("data-src-android", "data-src", "data-media-url")
+    }
+    PAGINATOR_LINKS_XPATH = etree.XPath("//a[@class='page']//a")
+    NEXT_EPISODE_LINKS_XPATH = etree.XPath(
+        "//nav//a[not(contains(@class, 'disabled'))]//span[contains(text(), '')]",
+    )
+    # Contenedores de los campos de un episodio, identificados por (tag, class)
+    EPISODE_FIELD_CONTAINERS = {
+        ("p", "title-wrapper text-ellipsis-multiple"): "title",
+        ("div", "header-modulo"): "header",
+        ("p", "time"): "time",
+        ("li", "likes"): "likes",
+        ("li", "comments"): "comments",
+    }
 
     def __init__(self, timeout: int = REQUEST_TIMEOUT):
         self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.PAGE_BATCH_SIZE,
+            thread_name_prefix="ivoox-fetch",
+        )
         self.session = requests.Session()
         self.session.headers.update(
             {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
             },
         )
+        # Una conexión keep-alive por cada petición concurrente de un lote,
+        # así ninguna página paga de nuevo el handshake TCP/TLS.
+        adapter = HTTPAdapter(pool_maxsize=self.PAGE_BATCH_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Un parser por hilo de descarga: lxml serializa el uso de un mismo parser
+        self._parser_local = threading.local()
 
     def search_podcast(
         self,
@@ -86,23 +135,22 @@ class IvooxAPI:
         """
         results = []
         start_page = page if page is not None else 1
-        current_page = start_page
 
-        while True:
-            url = f"{self.BASE_URL}/{query}_sw_1_{current_page}.html"
-            logger.info(f"Searching: {url}")
+        for url, podcasts in self._iter_pages(
+            lambda current_page: f"{self.BASE_URL}/{query}_sw_1_{current_page}.html",
+            start_page,
+            self._parse_podcast_nodes,
+            batch_size=1 if page is not None else None,
+        ):
+            logger.info("Searching: %s", url)
 
-            tree = self._fetch_and_parse(url)
-            if tree is None:
-                break
-
-            podcasts = self._parse_podcast_nodes(tree)
             if not podcasts:
                 break
 
             results.extend(podcast.to_dict() for podcast in podcasts)
 
-            current_page += 1
+            if page is not None:
+                break
 
         return results
 
@@ -123,15 +171,17 @@ class IvooxAPI:
         """
         result = {"name": "", "episodes": []}
         start_page = page if page is not None else 1
-        current_page = start_page
 
-        while True:
-            url = f"{self.BASE_URL}/test_sq_{podcast_id}_{current_page}.html"
-            logger.info(f"Fetching episodes: {url}")
-
-            tree = self._fetch_and_parse(url)
-            if tree is None:
-                break
+        for current_page, (url, (tree, episodes)) in enumerate(
+            self._iter_pages(
+                lambda current_page: f"{self.BASE_URL}/test_sq_{podcast_id}_{current_page}.html",
+                start_page,
+                lambda tree: (tree, self._parse_episode_nodes(tree)),
+                batch_size=1,
+            ),
+            start=start_page,
+        ):
+            logger.info("Fetching episodes: %s", url)
 
             if not result["name"]:
                 result["name"] = self._extract_podcast_name(tree, current_page)
@@ -139,7 +189,6 @@ class IvooxAPI:
                     logger.error("Could not find podcast title. Invalid ID?")
                     break
 
-            episodes = self._parse_episode_nodes(tree)
             if not episodes:
                 break
 
@@ -148,8 +197,6 @@ class IvooxAPI:
             if page is not None or not self._has_next_page(tree):
                 break
 
-            current_page += 1
-
         return result
 
     def get_mp3_links(
@@ -159,52 +206,97 @@ class IvooxAPI:
     ) -> list[dict[str, str]]:
         """
         Extrae los enlaces MP3 directamente del listado de episodios.
+        Con ``page`` se lee solo esa página; sin él, todas.
         """
         all_mp3s = []
-        base_url = re.sub(r"_\d+\.html$", "", podcast_url)
+        # Episodios cuya URL de escucha no sale del _rf_ del enlace
+        unresolved = []
+        base_url = self.PAGE_SUFFIX_PATTERN.sub("", podcast_url)
         start_page = page if page is not None else 1
-        current_page = start_page
 
-        while True:
-            url = f"{base_url}_{current_page}.html"
-            logger.info(f"\nObteniendo MP3s de página {current_page}: {url}")
-
-            tree = self._fetch_and_parse(url)
-            if tree is None:
+        for current_page, (url, mp3s) in enumerate(
+            self._iter_pages(
+                lambda current_page: f"{base_url}_{current_page}.html",
+                start_page,
+                self._parse_mp3_links,
+                batch_size=1 if page is not None else None,
+            ),
+            start=start_page,
+        ):
+            logger.info("\nObteniendo MP3s de página %s: %s", current_page, url)
+
+            if not mp3s:
+                logger.info("No hay más episodios")
                 break
 
-            # Buscar todos los enlaces con mp3_rf_
-            episode_links = tree.xpath(
-                "//a[contains(@href, 'mp3_rf_') and contains(@class, 'font-size-14 font-size-md-16')]",
-            )
-            episode_thumbnails = tree.xpath(
-                "//img[contains(@src, 'img-static.ivoox.com') and contains(@class, 'img-hover img-rounded')]",
-            )
+            for mp3, link in mp3s:
+                all_mp3s.append(mp3)
+                if link is not None:
+                    unresolved.append((mp3, link))
 
-            if not episode_links:
-                logger.info("No hay más episodios")
+            logger.info("  ✓ %s episodios en esta página", len(mp3s))
+
+            if page is not None:
                 break
 
-            for i in range(len(episode_links)):
-                link = episode_links[i]
-                thumbnail = episode_thumbnails[i]
-                href = link.get("href", "")
-                title = link.get("title") or link.text_content().strip()
-                thumb_src = thumbnail.get("src", "")
-                all_mp3s.append(
+        if unresolved:
+            self._resolve_from_episode_pages(unresolved)
+
+        logger.info("\n✓ Total: %s MP3s encontrados", len(all_mp3s))
+        return all_mp3s
+
+    def _parse_mp3_links(
+        self,
+        tree: html.HtmlElement,
+    ) -> list[tuple[dict[str, str], html.HtmlElement | None]]:
+        """
+        Extract the MP3 entries of one episode listing page.
+
+        Each entry comes with its link element when the listen URL could
+        not be derived from the ``_rf_`` reference, so the caller can fall
+        back to the episode page; otherwise the element is None.
+        """
+        mp3s = []
+        # Buscar todos los enlaces con mp3_rf_
+        episode_links = self.MP3_LINKS_XPATH(tree)
+        episode_thumbnails = self.MP3_THUMBNAILS_XPATH(tree)
+
+        for i in range(len(episode_links)):
+            link = episode_links[i]
+            thumbnail = episode_thumbnails[i]
+            href = link.get("href", "")
+            title = link.get("title") or link.text_content().strip()
+            thumb_src = thumbnail.get("src", "")
+            mp3_url = self.construir_url_audio(self._absolute_url(href))
+            mp3s.append(
+                (
                     {
                         "title": title,
-                        "mp3_url": self.construir_url_audio(self.BASE_URL + href),
+                        "mp3_url": mp3_url,
                         "thumbnail": thumb_src,
                     },
-                )
+                    link if mp3_url == self.AUDIO_URL_ERROR else None,
+                ),
+            )
 
-            logger.info(f"  ✓ {len(episode_links)} episodios en esta página")
+        return mp3s
 
-            current_page += 1
+    def _resolve_from_episode_pages(
+        self,
+        unresolved: list[tuple[dict[str, str], html.HtmlElement]],
+    ) -> None:
+        """
+        Fill in the MP3 URL of entries the listing could not resolve.
 
-        logger.info(f"\n✓ Total: {len(all_mp3s)} MP3s encontrados")
-        return all_mp3s
+        Each one needs its own episode page, so they are fetched
+        concurrently on the fetch pool (bounded by PAGE_BATCH_SIZE).
+        Entries still unresolved keep the error message as their URL.
+        """
+        logger.info("  -> %s episodios sin referencia _rf_, visitando sus páginas", len(unresolved))
+        found = self._executor.map(self._extract_mp3_from_episode, [link for _, link in unresolved])
+        for (mp3, _), episode_mp3 in zip(unresolved, found, strict=True):
+            if episode_mp3 is not None:
+                mp3["mp3_url"] = episode_mp3["mp3_url"]
 
     def construir_url_audio(self, url_original):
         """
@@ -219,13 +311,9 @@ class IvooxAPI:
             str: La URL de escucha directa
             (ej: 'https://www.ivoox.com/listen_mn_161629863_1.mp3').
         """
-        # Patrón de expresión regular para capturar la parte que deseas.
-        # Busca '_rf_' seguido de uno o más dígitos, un guion bajo y otro dígito,
-        # y lo captura en un grupo.
-        patron = r"_rf_(\d+_\d+)\.html"
-
-        # Buscar el patrón en la URL original
-        coincidencia = re.search(patron, url_original)
+        # AUDIO_REF_PATTERN busca '_rf_' seguido de uno o más dígitos,
+        # un guion bajo y otro dígito, y lo captura en un grupo.
+        coincidencia = self.AUDIO_REF_PATTERN.search(url_original)
 
         if coincidencia:
             # El grupo 1 contiene el número deseado (ej: '161629863_1')
@@ -234,26 +322,92 @@ class IvooxAPI:
             # Construir la nueva URL
             return f"https://www.ivoox.com/listen_mn_{numero_referencia}.mp3"
         # Devolver un mensaje de error si no se encuentra el patrón
-        return "Error: No se pudo extraer el número de referencia de la URL proporcionada."
+        return self.AUDIO_URL_ERROR
 
     def _fetch_and_parse(self, url: str) -> html.HtmlElement | None:
         """Fetch URL and parse HTML, returning None on error."""
         try:
             response = self.session.get(url, timeout=self.timeout)
             response.raise_for_status()
-            return html.fromstring(response.text)
+            # Pasamos los bytes tal cual: evitamos que requests adivine la
+            # codificación y el ida y vuelta bytes -> str -> bytes hacia libxml2
+            return html.fromstring(response.content, parser=self._html_parser())
         except requests.RequestException as e:
-            logger.error(f"Failed to fetch {url}: {e}")
+            logger.error("Failed to fetch %s: %s", url, e)
+            return None
+
+    def _absolute_url(self, url: str) -> str:
+        """
+        Make an ivoox href absolute.
+
+        The links on ivoox pages are either absolute or root-relative, so a
+        prefix check and a concatenation replace a full urljoin() parse.
+        """
+        if url.startswith(("http://", "https://")):
+            return url
+        if url.startswith("//"):
+            return f"https:{url}"
+        if url.startswith("/"):
+            return f"{self.BASE_URL}{url}"
+        return f"{self.BASE_URL}/{url}"
+
+    def _html_parser(self) -> html.HTMLParser:
+        """Return this thread's HTML parser, creating it on first use."""
+        parser = getattr(self._parser_local, "parser", None)
+        if parser is None:
+            parser = html.HTMLParser(encoding="utf-8", remove_comments=True, collect_ids=False)
+            self._parser_local.parser = parser
+        return parser
+
+    def _iter_pages[T](
+        self,
+        build_url: Callable[[int], str],
+        start_page: int,
+        parse: Callable[[html.HtmlElement], T],
+        batch_size: int | None = None,
+    ) -> Iterator[tuple[str, T]]:
+        """
+        Yield (url, parse(tree)) for consecutive pages, in order.
+
+        Pages are requested in batches of ``batch_size`` concurrent requests
+        so a listing costs one round trip per batch instead of one per page.
+        ``parse`` runs on the fetch thread right after its download, so a
+        page is parsed while the rest of the batch is still in flight.
+        Iteration stops at the first page that fails to download; callers
+        stop earlier by breaking out of the loop.
+        """
+        batch_size = batch_size or self.PAGE_BATCH_SIZE
+        fetch_page = partial(self._fetch_and_extract, parse=parse)
+        current_page = start_page
+
+        while True:
+            urls = [build_url(number) for number in range(current_page, current_page + batch_size)]
+            for url, page in zip(urls, self._executor.map(fetch_page, urls), strict=True):
+                if page is None:
+                    return
+                yield url, page[0]
+
+            current_page += batch_size
+
+    def _fetch_and_extract[T](
+        self,
+        url: str,
+        parse: Callable[[html.HtmlElement], T],
+    ) -> tuple[T] | None:
+        """Fetch and parse one page; the result is wrapped so None always means a failed fetch."""
+        tree = self._fetch_and_parse(url)
+        if tree is None:
             return None
+        return (parse(tree),)
 
     def _parse_podcast_nodes(self, tree: html.HtmlElement) -> list[Podcast]:
         """Extract podcast data from parsed HTML."""
         podcasts = []
-        nodes = tree.xpath("//div[@class='front modulo-view modulo-type-programa']")
+        nodes = self.PODCAST_NODES_XPATH(tree)
 
         for node in nodes:
             try:
-                link = node.xpath(".//a")[0]
+                link = node.find(".//a")
                 url = link.get("href", "")
 
                 if "_sq_" not in url or url.startswith("_sq_"):
@@ -268,11 +422,11 @@ class IvooxAPI:
                         id=match.group(1),
                         name=link.get("title", ""),
                         ivoox_url=url,
-                        thumbnail=node.xpath(".//img")[0].get("src", ""),
+                        thumbnail=node.find(".//img").get("src", ""),
                     ),
                 )
             except (IndexError, AttributeError) as e:
-                logger.debug(f"Error parsing podcast node: {e}")
+                logger.debug("Error parsing podcast node: %s", e)
                 continue
 
         return podcasts
@@ -280,38 +434,52 @@ class IvooxAPI:
     def _parse_episode_nodes(self, tree: html.HtmlElement) -> list[Episode]:
         """Extract episode data from parsed HTML."""
         episodes = []
-        nodes = tree.xpath("//div[@class='front modulo-view modulo-type-episodio']")
+        nodes = self.EPISODE_NODES_XPATH(tree)
 
         for node in nodes:
             try:
-                title_wrapper = node.xpath(
-                    ".//p[@class='title-wrapper text-ellipsis-multiple']",
-                )[0]
-                link = title_wrapper.xpath(".//a")[0]
+                fields = self._collect_episode_fields(node)
+                title_wrapper = fields["title"]
+                link = title_wrapper.find(".//a")
 
                 episodes.append(
                     Episode(
                         name=link.get("title", ""),
                         url=link.get("href", ""),
-                        description=title_wrapper.xpath(".//button")[0].get(
+                        description=title_wrapper.find(".//button").get(
                             "data-content",
                             "",
                         ),
-                        thumbnail=node.xpath(".//div[@class='header-modulo']//img")[0].get("src", ""),
-                        duration=node.xpath(".//p[@class='time']")[0].text_content().strip(),
-                        likes=node.xpath(".//li[@class='likes']//a")[0].text_content().strip(),
-                        comments=node.xpath(".//li[@class='comments']//a")[0].text_content().strip(),
+                        thumbnail=fields["header"].find(".//img").get("src", ""),
+                        duration=fields["time"].text_content().strip(),
+                        likes=fields["likes"].find(".//a").text_content().strip(),
+                        comments=fields["comments"].find(".//a").text_content().strip(),
                     ),
                 )
-            except (IndexError, AttributeError) as e:
-                logger.debug(f"Error parsing episode node: {e}")
+            except (IndexError, KeyError, AttributeError) as e:
+                logger.debug("Error parsing episode node: %s", e)
                 continue
 
         return episodes
 
+    def _collect_episode_fields(self, node: html.HtmlElement) -> dict[str, html.HtmlElement]:
+        """
+        Locate the field containers of an episode node in a single walk.
+
+        Only div/p/li descendants are visited and the first container of
+        each kind wins, so the node subtree is traversed once instead of
+        once per field.
+        """
+        fields = {}
+        for element in node.iter("div", "p", "li"):
+            field = self.EPISODE_FIELD_CONTAINERS.get((element.tag, element.get("class")))
+            if field is not None and field not in fields:
+                fields[field] = element
+        return fields
+
     def _extract_podcast_name(self, tree: html.HtmlElement, page: int) -> str:
         """Extract podcast name from page."""
-        name_nodes = tree.xpath("//*[@id='list_title_new']")
+        name_nodes = self.PODCAST_TITLE_XPATH(tree)
         return name_nodes[0].text_content().strip() if name_nodes else ""
 
     def _extract_mp3_from_episode(
@@ -322,38 +490,35 @@ class IvooxAPI:
         try:
             relative_url = link.get("href", "")
             title = link.text_content().strip()
-            episode_url = urljoin(self.BASE_URL, relative_url)
+            episode_url = self._absolute_url(relative_url)
 
-            logger.info(f"  -> Scraping: {title[:50]}...")
+            logger.info("  -> Scraping: %s...", title[:50])
 
             tree = self._fetch_and_parse(episode_url)
             if tree is None:
                 return None
 
             # Intentar metodo 1: buscar en el objeto __NUXT__ (datos JSON embebidos)
-            script_tags = tree.xpath("//script[contains(text(), 'mediaUrl')]")
+            script_tags = self.MEDIA_URL_SCRIPTS_XPATH(tree)
             for script in script_tags:
                 script_text = script.text_content()
                 # Buscar el patrón del mediaUrl
-                match = re.search(r'mediaUrl["\s:]+([^"\']+\.mp3)', script_text)
+                match = self.MEDIA_URL_PATTERN.search(script_text)
                 if match:
-                    mp3_url = match.group(1)
-                    if not mp3_url.startswith("http"):
-                        mp3_url = urljoin(self.BASE_URL, mp3_url)
-                    return {"title": title, "mp3_url": mp3_url}
+                    return {"title": title, "mp3_url": self._absolute_url(match.group(1))}
 
             # Metodo 2: buscar atributos data-src alternativos
-            for attr in ["data-src-android", "data-src", "data-media-url"]:
-                mp3_nodes = tree.xpath(f"//button[@{attr}] | //*[@{attr}]")
+            for attr, attr_xpath in self.MEDIA_ATTR_XPATHS.items():
+                mp3_nodes = attr_xpath(tree)
                 if mp3_nodes:
                     relative_mp3 = mp3_nodes[0].get(attr, "")
                     if relative_mp3:
                         return {
                             "title": title,
-                            "mp3_url": urljoin(self.BASE_URL, relative_mp3),
+                            "mp3_url": self._absolute_url(relative_mp3),
                         }
 
-            logger.warning(f"     No MP3 found for '{title}'")
+            logger.warning("     No MP3 found for '%s'", title)
             return None
 
         except Exception:
@@ -362,18 +527,17 @@ class IvooxAPI:
 
     def _has_next_page(self, tree: html.HtmlElement) -> bool:
         """Check if pagination has a next page."""
-        paginator_links = tree.xpath("//a[@class='page']//a")
+        paginator_links = self.PAGINATOR_LINKS_XPATH(tree)
         return paginator_links and paginator_links[-1].get("href") != "#"
 
     def _has_next_episode_page(self, tree: html.HtmlElement) -> bool:
         """Check if there's a next page for episodes."""
-        next_links = tree.xpath(
-            "//nav//a[not(contains(@class, 'disabled'))]//span[contains(text(), '')]",
-        )
+        next_links = self.NEXT_EPISODE_LINKS_XPATH(tree)
         return bool(next_links)
 
     def close(self):
-        """Close the session."""
+        """Close the session and the fetch thread pool."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
         self.session.close()
 
     def __enter__(self):
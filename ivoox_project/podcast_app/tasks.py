@@ -1,15 +1,68 @@
+import functools
+import json
 import logging
 
 from celery import shared_task
+from celery.signals import worker_process_init, worker_process_shutdown
 from django.core.cache import cache
 
-from .constants import CACHE_TTL_1M
-from .constants import CACHE_TTL_24H
+from .cache_keys import episodes_key, fresh_key, search_key, task_lock_key
+from .constants import EPISODES_CACHE_TTL, FAILED_TASK_LOCK_TTL, REFRESH_AHEAD_WINDOW, SEARCH_CACHE_TTL
 from .scraper import IvooxAPI
 
 logger = logging.getLogger(__name__)
 
 
+def store_result(cache_key, data, ttl):
+    """
+    Guarda el resultado de un scraping junto con su marca de frescura.
+    Se guarda ya serializado como el cuerpo JSON de la respuesta SUCCESS:
+    las vistas de datos lo devuelven tal cual, sin pickle ni json.dumps
+    en cada petición.
+    La marca caduca REFRESH_AHEAD_WINDOW antes que el dato: a partir de
+    ahí las vistas siguen sirviendo el dato pero lanzan su refresco.
+    """
+    body = json.dumps({"status": "SUCCESS", "data": data}, separators=(",", ":")).encode()
+    cache.set(cache_key, body, timeout=ttl)
+    cache.set(fresh_key(cache_key), value=True, timeout=ttl - REFRESH_AHEAD_WINDOW)
+
+
+def release_task_lock(cache_key, *, failed=False):
+    """
+    Libera la reserva que hicieron las vistas al lanzar la tarea.
+    Si ha ido bien, los datos ya están en caché y la reserva sobra. Si ha
+    fallado, la dejamos un rato más: las vistas pueden mostrar el error
+    y no se relanza el scraping en bucle contra un iVoox que está fallando.
+    """
+    lock_key = task_lock_key(cache_key)
+    if failed:
+        cache.touch(lock_key, FAILED_TASK_LOCK_TTL)
+    else:
+        cache.delete(lock_key)
+
+
+@functools.cache
+def get_api():
+    """
+    Cliente de iVoox compartido por todas las tareas del proceso worker.
+    Reutilizarlo mantiene vivo el pool de conexiones (TCP/TLS) entre tareas.
+    """
+    return IvooxAPI()
+
+
+@worker_process_init.connect
+def init_api(**kwargs):
+    # Descartamos cualquier cliente heredado del padre: sus hilos no sobreviven al fork
+    get_api.cache_clear()
+    get_api()
+
+
+@worker_process_shutdown.connect
+def close_api(**kwargs):
+    get_api().close()
+    get_api.cache_clear()
+
+
 @shared_task(
     ignore_result=False,
 )  # ignore_result=False es clave para guardar el resultado
@@ -20,27 +73,28 @@ def scrape_podcast_episodes_task(podcast_url):
     en el backend de resultados de Celery (Redis)
     Y también lo guardaremos en el caché de Django.
     """
-    logger.info(f"[TAREA CELERY] Iniciando scraping para: {podcast_url}")
+    logger.info("[TAREA CELERY] Iniciando scraping para: %s", podcast_url)
 
     # 1. Definir la clave de caché
-    cache_key = f"episodes_view_{podcast_url}"
+    cache_key = episodes_key(podcast_url)
 
     try:
-        with IvooxAPI() as api:
-            # ¡EL TRABAJO PESADO DE 10 MINUTOS!
-            mp3_links = api.get_mp3_links(podcast_url)
+        # ¡EL TRABAJO PESADO DE 10 MINUTOS!
+        mp3_links = get_api().get_mp3_links(podcast_url)
 
         # 2. Guardar en el caché de Django
-        cache.set(cache_key, mp3_links, timeout=CACHE_TTL_24H)
+        store_result(cache_key, mp3_links, EPISODES_CACHE_TTL)
+        release_task_lock(cache_key)
 
-        logger.info(f"[TAREA CELERY] Éxito. Guardado en caché: {cache_key}")
+        logger.info("[TAREA CELERY] Éxito. Guardado en caché: %s", cache_key)
 
         # 3. Devolver el resultado
         # Celery guardará esto en el backend de resultados (Redis db 1)
         return mp3_links
 
     except Exception as e:
-        logger.error(f"[TAREA CELERY] Error en scraping: {e}")
+        logger.error("[TAREA CELERY] Error en scraping: %s", e)
+        release_task_lock(cache_key, failed=True)
         # Cuando Celery ve una excepción, marca la tarea como 'FAILURE'
         raise
 
@@ -53,25 +107,26 @@ def search_podcast_task(query):
     en el backend de resultados de Celery (Redis)
     Y también lo guardaremos en el caché de Django.
     """
-    logger.info(f"[TAREA CELERY] Iniciando BÚSQUEDA para: {query}")
+    logger.info("[TAREA CELERY] Iniciando BÚSQUEDA para: %s", query)
 
     # 1. Definir la clave de caché
-    cache_key = f"search_view_{query.lower().replace(' ', '_')}"
+    cache_key = search_key(query)
 
     try:
-        with IvooxAPI() as api:
-            # ¡EL TRABAJO PESADO DE BÚSQUEDA!
-            podcasts = api.search_podcast(query)
+        # ¡EL TRABAJO PESADO DE BÚSQUEDA!
+        podcasts = get_api().search_podcast(query)
 
         # 2. Guardar en el caché de Django
-        cache.set(cache_key, podcasts, timeout=CACHE_TTL_1M)
+        store_result(cache_key, podcasts, SEARCH_CACHE_TTL)
+        release_task_lock(cache_key)
 
-        logger.info(f"[TAREA CELERY] Éxito. Búsqueda guardada en caché: {cache_key}")
+        logger.info("[TAREA CELERY] Éxito. Búsqueda guardada en caché: %s", cache_key)
 
         # 3. Devolver el resultado
         return podcasts
 
     except Exception as e:
-        logger.error(f"[TAREA CELERY] Error en scraping de búsqueda: {e}")
+        logger.error("[TAREA CELERY] Error en scraping de búsqueda: %s", e)
+        release_task_lock(cache_key, failed=True)
         # La tarea se marcará como 'FAILURE'
         raise
@@ -1 +1,282 @@
-# Create your tests here.
+import json
+import uuid
+from http import HTTPStatus
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.db.models import QuerySet
+from django.urls import reverse
+
+from ivoox_project.podcast_app.cache_keys import episodes_key, fresh_key, search_key, task_lock_key, task_meta_key
+from ivoox_project.podcast_app.constants import TASK_META_CACHE_TTL
+from ivoox_project.podcast_app.local_cache import LocalTTLCache
+from ivoox_project.podcast_app.models import FavoritePodcast
+from ivoox_project.podcast_app.scraper import IvooxAPI
+from ivoox_project.podcast_app.tasks import release_task_lock, scrape_podcast_episodes_task, search_podcast_task
+from ivoox_project.podcast_app.views import (
+    TaskStatusStreamView,
+    TaskStatusView,
+    _group_status_payload,
+    _launch_task_once,
+    _task_status_payload,
+)
+
+
+def test_search_key_normalizes_case_and_whitespace():
+    assert search_key("Foo  Bar ") == search_key("foo bar")
+    assert search_key("foo bar") != search_key("foobar")
+
+
+def test_release_task_lock_deletes_lock_on_every_call():
+    cache.clear()
+    lock_key = task_lock_key(search_key("foo"))
+    for _ in range(2):
+        cache.set(lock_key, "task-id")
+        release_task_lock(search_key("foo"))
+        assert cache.get(lock_key) is None
+
+
+def test_search_podcast_task_stores_body_and_fresh_marker():
+    cache.clear()
+    podcasts = [{"id": "1", "name": "Foo"}]
+    with patch("ivoox_project.podcast_app.tasks.get_api") as get_api:
+        get_api.return_value.search_podcast.return_value = podcasts
+        assert search_podcast_task("Foo") == podcasts
+
+    cache_key = search_key("foo")
+    assert json.loads(cache.get(cache_key)) == {"status": "SUCCESS", "data": podcasts}
+    assert cache.get(fresh_key(cache_key)) is True
+
+
+def test_keys_have_fixed_length_and_domain_prefix():
+    url = "https://www.ivoox.com/podcast-foo_sq_f1123456_1.html?utm_source=x&a=b:c"
+    key = episodes_key(url)
+    assert key.startswith("episodes:")
+    assert len(key) == len("episodes:") + 32
+    assert len(search_key("x" * 1000)) == len("search:") + 32
+
+
+def test_episodes_key_normalizes_url():
+    url = "https://www.ivoox.com/podcast-foo_sq_f1123456_1.html"
+    assert episodes_key("HTTPS://WWW.IVOOX.COM/podcast-foo_sq_f1123456_1.html/") == episodes_key(url)
+    assert episodes_key(f"{url}?utm_source=x&utm_medium=y#top") == episodes_key(url)
+    assert episodes_key(f"{url}?page=2") != episodes_key(url)
+
+
+def test_absolute_url():
+    with IvooxAPI() as api:
+        assert api._absolute_url("/foo_rf_1_1.html") == "https://www.ivoox.com/foo_rf_1_1.html"  # noqa: SLF001
+        assert api._absolute_url("foo.mp3") == "https://www.ivoox.com/foo.mp3"  # noqa: SLF001
+        assert api._absolute_url("//cdn.ivoox.com/a.mp3") == "https://cdn.ivoox.com/a.mp3"  # noqa: SLF001
+        assert api._absolute_url("http://www.ivoox.com/a.html") == "http://www.ivoox.com/a.html"  # noqa: SLF001
+
+
+def test_construir_url_audio():
+    with IvooxAPI() as api:
+        url = api.construir_url_audio("https://www.ivoox.com/horizonte-audios-mp3_rf_161629863_1.html")
+        assert url == "https://www.ivoox.com/listen_mn_161629863_1.mp3"
+        assert api.construir_url_audio("https://www.ivoox.com/sin-referencia.html") == api.AUDIO_URL_ERROR
+
+
+def test_iter_pages_yields_in_order_and_stops_at_failed_fetch():
+    last_page = 11
+    with IvooxAPI() as api, patch.object(api, "_fetch_and_parse") as fetch:
+        fetch.side_effect = lambda url: None if url == f"p{last_page}" else url
+        pages = list(api._iter_pages(lambda number: f"p{number}", 1, str.upper))  # noqa: SLF001
+
+    assert pages == [(f"p{number}", f"P{number}") for number in range(1, last_page)]
+
+
+def test_iter_pages_single_page_mode_stops_at_empty_page():
+    empty_page = "p3"
+    with IvooxAPI() as api, patch.object(api, "_fetch_and_parse") as fetch:
+        fetch.side_effect = lambda url: url
+        pages = []
+        for page in api._iter_pages(  # noqa: SLF001
+            lambda number: f"p{number}",
+            1,
+            lambda tree: [] if tree == empty_page else [tree],
+            batch_size=1,
+        ):
+            pages.append(page)
+            if not page[1]:
+                break
+
+    assert pages == [("p1", ["p1"]), ("p2", ["p2"]), (empty_page, [])]
+    assert [call.args[0] for call in fetch.call_args_list] == ["p1", "p2", empty_page]
+
+
+def test_local_ttl_cache_evicts_least_recently_used():
+    local_cache = LocalTTLCache(maxsize=2, ttl=30)
+    first, second, third = object(), object(), object()
+    local_cache.set("a", first)
+    local_cache.set("b", second)
+    assert local_cache.get("a") is first
+    local_cache.set("c", third)
+    assert local_cache.get("b") is None
+    assert local_cache.get("a") is first
+    assert local_cache.get("c") is third
+
+
+def test_local_ttl_cache_expires_entries():
+    local_cache = LocalTTLCache(ttl=0)
+    local_cache.set("a", 1)
+    assert local_cache.get("a") is None
+
+
+PODCAST_URL = "https://www.ivoox.com/podcast-foo_sq_f1123456_1.html"
+
+
+def test_launch_task_once_releases_lock_when_publish_fails():
+    cache.clear()
+    task = Mock()
+    task.apply_async.side_effect = OSError("broker down")
+    with pytest.raises(OSError, match="broker down"):
+        _launch_task_once(task, "foo", search_key("foo"))
+    assert cache.get(task_lock_key(search_key("foo"))) is None
+
+
+def test_launch_task_once_without_cache_launches_unlocked():
+    task = Mock()
+    with patch("ivoox_project.podcast_app.views.cache") as unreachable_cache:
+        unreachable_cache.add.return_value = None
+        unreachable_cache.get.return_value = None
+        task_id = _launch_task_once(task, "foo", search_key("foo"))
+    task.apply_async.assert_called_once_with(args=("foo",), task_id=task_id)
+
+
+@pytest.mark.django_db
+def test_episode_data_miss_launches_task_once(client, user):
+    cache.clear()
+    client.force_login(user)
+    url = reverse("api_episodes_data")
+    with (
+        patch.object(scrape_podcast_episodes_task, "apply_async") as apply_async,
+        patch("ivoox_project.podcast_app.views._inline_result", return_value=None),
+    ):
+        first = client.get(url, {"url": PODCAST_URL}).json()
+        second = client.get(url, {"url": PODCAST_URL}).json()
+
+    assert first["status"] == "PROCESSING"
+    assert second["task_id"] == first["task_id"]
+    apply_async.assert_called_once_with(args=(PODCAST_URL,), task_id=first["task_id"])
+    assert cache.get(task_lock_key(episodes_key(PODCAST_URL))) == first["task_id"]
+
+
+@pytest.mark.django_db
+def test_batch_skips_cached_and_running_items(client, user):
+    cache.clear()
+    client.force_login(user)
+    cache.set(search_key("cached"), b'{"status":"SUCCESS","data":[]}')
+    cache.set(task_lock_key(search_key("running")), "running-task-id")
+    with patch("ivoox_project.podcast_app.views.group") as group:
+        group.return_value.apply_async.return_value.id = "group-id"
+        response = client.post(reverse("api_batch"), {"search": ["cached", "running", "new", "NEW "]}).json()
+
+    (signatures,) = group.call_args.args
+    assert [signature.args for signature in signatures] == [("new",)]
+    assert cache.get(task_lock_key(search_key("new"))) == signatures[0].options["task_id"]
+    assert response == {"status": "PROCESSING", "group_id": "group-id", "task_ids": ["running-task-id"]}
+
+
+def test_task_status_payload_does_not_forget_group_children():
+    cache.clear()
+    task = Mock(id="child-id")
+    task._get_task_meta.return_value = {"status": "SUCCESS", "result": [], "group_id": "group-id"}  # noqa: SLF001
+    assert _task_status_payload(task)["status"] == "SUCCESS"
+    assert cache.get(task_meta_key("child-id"))["status"] == "SUCCESS"
+    task.forget.assert_not_called()
+
+
+def test_group_status_payload_caches_children_before_forgetting():
+    cache.clear()
+    child = Mock(id="child-id")
+    child._get_task_meta.return_value = {"status": "FAILURE", "result": None}  # noqa: SLF001
+    group_result = MagicMock(id="group-id", results=[child])
+    group_result.ready.return_value = True
+    group_result.completed_count.return_value = 0
+    group_result.__len__.return_value = 1
+
+    assert _group_status_payload(group_result)["status"] == "ERROR"
+    assert cache.get(task_meta_key("child-id"))["status"] == "ERROR"
+    assert cache.get(task_meta_key("group-id"))["status"] == "ERROR"
+    group_result.forget.assert_called_once_with()
+
+
+@pytest.mark.django_db
+def test_refresh_ahead_failure_still_serves_cached_body(client, user):
+    cache.clear()
+    client.force_login(user)
+    body = b'{"status":"SUCCESS","data":[]}'
+    # Sin marca fresh: el dato está a punto de caducar y se lanza su refresco
+    cache.set(episodes_key(PODCAST_URL), body)
+    with patch.object(scrape_podcast_episodes_task, "apply_async", side_effect=OSError("broker down")):
+        response = client.get(reverse("api_episodes_data"), {"url": PODCAST_URL})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.content == body
+    assert cache.get(task_lock_key(episodes_key(PODCAST_URL))) is None
+
+
+@pytest.mark.django_db
+def test_favorites_out_of_range_page_falls_back_to_last_page(client, user):
+    client.force_login(user)
+    FavoritePodcast.objects.create(
+        user=user,
+        ivoox_id="1",
+        name="Foo",
+        ivoox_url=PODCAST_URL,
+        thumbnail_url="https://www.ivoox.com/foo.jpg",
+    )
+    response = client.get(reverse("favorites"), {"page": 2})
+    assert response.status_code == HTTPStatus.OK
+    assert response.context["page_obj"].number == 1
+
+
+@pytest.mark.django_db
+def test_toggle_favorite_concurrent_add_is_not_an_error(client, user):
+    client.force_login(user)
+    favorite = {
+        "ivoox_id": "1",
+        "name": "Foo",
+        "ivoox_url": PODCAST_URL,
+        "thumbnail_url": "https://www.ivoox.com/foo.jpg",
+    }
+    FavoritePodcast.objects.create(user=user, **favorite)
+    # Otra petición creó el favorito entre nuestro DELETE y nuestro INSERT
+    with patch.object(QuerySet, "delete", return_value=(0, {})):
+        response = client.post(reverse("toggle_favorite"), favorite)
+    assert response.status_code == HTTPStatus.FOUND
+    assert FavoritePodcast.objects.filter(user=user, ivoox_id="1").count() == 1
+
+
+@pytest.mark.django_db
+def test_toggle_favorite_reraises_other_integrity_errors(client, user):
+    client.force_login(user)
+    with pytest.raises(IntegrityError):
+        client.post(reverse("toggle_favorite"), {"ivoox_id": "1"})
+
+
+@pytest.mark.django_db
+def test_status_stream_does_not_block_without_long_poll(client, user, settings):
+    settings.TASK_STATUS_LONG_POLL_TIMEOUT = 0
+    cache.clear()
+    client.force_login(user)
+    with patch("ivoox_project.podcast_app.views.AsyncResult") as async_result:
+        async_result.return_value._get_task_meta.return_value = {"status": "STARTED"}  # noqa: SLF001
+        response = client.get(reverse("api_task_status_stream"), {"task_id": str(uuid.uuid4())})
+        body = b"".join(response.streaming_content)
+
+    async_result.return_value.get.assert_not_called()
+    assert body.startswith(b"event: done")
+
+
+def test_task_status_views_run_outside_request_transaction():
+    for view in (TaskStatusView, TaskStatusStreamView):
+        assert "default" in view.as_view()._non_atomic_requests  # noqa: SLF001
+
+
+def test_finished_task_status_outlives_backend_result(settings):
+    assert settings.CELERY_RESULT_EXPIRES <= TASK_META_CACHE_TTL
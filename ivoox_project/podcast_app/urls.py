@@ -1,12 +1,25 @@
 from django.urls import path
 
-from .views import EpisodeDataView, EpisodesView, FavoriteListView, SearchView, TaskStatusView, ToggleFavoriteView
+from .views import (
+    BatchView,
+    BulkDataView,
+    EpisodeDataView,
+    EpisodesView,
+    FavoriteListView,
+    SearchView,
+    TaskStatusStreamView,
+    TaskStatusView,
+    ToggleFavoriteView,
+)
 
 urlpatterns = [
     path("search/", SearchView.as_view(), name="search"),
     path("episodes/", EpisodesView.as_view(), name="episodes"),
     path("favorites/", FavoriteListView.as_view(), name="favorites"),
     path("api/episodes-data/", EpisodeDataView.as_view(), name="api_episodes_data"),
+    path("api/batch/", BatchView.as_view(), name="api_batch"),
+    path("api/bulk-data/", BulkDataView.as_view(), name="api_bulk_data"),
     path("api/task-status/", TaskStatusView.as_view(), name="api_task_status"),
+    path("api/task-status/stream/", TaskStatusStreamView.as_view(), name="api_task_status_stream"),
     path("toggle-favorite/", ToggleFavoriteView.as_view(), name="toggle_favorite"),
 ]
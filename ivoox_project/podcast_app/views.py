@@ -1,18 +1,314 @@
+import hashlib
+import json
 import logging
-
-from celery.result import AsyncResult
+import re
+import time
+import uuid
+from contextlib import suppress
+
+from celery import group
+from celery.exceptions import TimeoutError as CeleryTimeoutError
+from celery.result import AsyncResult, GroupResult
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.cache import cache
-from django.http import HttpResponseBadRequest, JsonResponse
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect
+from django.utils.cache import add_never_cache_headers, get_conditional_response, patch_cache_control
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control, never_cache
 from django.views.generic import ListView, TemplateView, View
 
+from .cache_keys import episodes_key, fresh_key, search_key, task_lock_key, task_meta_key
+from .constants import TASK_LOCK_TTL, TASK_META_CACHE_TTL
+from .local_cache import LocalTTLCache
 from .models import FavoritePodcast
 from .tasks import scrape_podcast_episodes_task, search_podcast_task
 
 logger = logging.getLogger(__name__)
 
+# Cuánto espera una vista de datos, tras lanzar la tarea, antes de
+# responder PROCESSING: los scrapings rápidos se devuelven ya en línea.
+INLINE_RESULT_TIMEOUT = 0.2
+
+# Máximo de búsquedas + URLs que acepta BulkDataView en una petición
+BULK_MAX_ITEMS = 20
+
+# Caché L1 del proceso para los datos de búsqueda y episodios más pedidos
+_local_cache = LocalTTLCache(maxsize=1024, ttl=30)
+
+# Forma de los task_id que generamos (uuid4)
+_TASK_ID_RE = re.compile(r"^[0-9a-f-]{36}$")
+
+
+def _user_favorite_ids(user, podcasts):
+    """
+    Devuelve qué podcasts de ``podcasts`` son favoritos del usuario.
+    Solo se consultan los IDs que se muestran, no todos sus favoritos:
+    la consulta usa el índice único (user, ivoox_id) y su coste no crece
+    con el número de favoritos guardados.
+    """
+    return set(
+        FavoritePodcast.objects.filter(
+            user=user,
+            ivoox_id__in=[podcast["id"] for podcast in podcasts],
+        ).values_list("ivoox_id", flat=True),
+    )
+
+
+def _launch_task_once(task, arg, cache_key):
+    """
+    Lanza ``task(arg)`` salvo que ya haya una tarea rellenando ``cache_key``.
+    cache.add es atómico (SET NX en Redis): solo la primera petición que
+    falla la caché reserva la clave y lanza la tarea; el resto recibe el
+    task_id de esa misma tarea en lugar de encolar un scraping duplicado.
+    """
+    lock_key = task_lock_key(cache_key)
+    task_id = str(uuid.uuid4())
+    # Un reintento cubre que la reserva caduque entre add y get
+    for _ in range(2):
+        if cache.add(lock_key, task_id, timeout=TASK_LOCK_TTL):
+            try:
+                task.apply_async(args=(arg,), task_id=task_id)
+            except Exception:
+                # Si no se pudo encolar (broker caído), la reserva apuntaría a
+                # una tarea que nunca existirá: la soltamos para reintentar.
+                cache.delete(lock_key)
+                raise
+            return task_id
+
+        running_task_id = cache.get(lock_key)
+        if running_task_id:
+            return running_task_id
+
+    # Ni reserva ni tarea en curso: Redis no responde (IGNORE_EXCEPTIONS
+    # convierte cada error en None). Lanzamos la tarea sin reserva.
+    logger.warning("Caché no disponible, lanzando la tarea sin reserva: %s", cache_key)
+    task.apply_async(args=(arg,), task_id=task_id)
+    return task_id
+
+
+def _get_cached_many(entries):
+    """
+    Devuelve ``{cache_key: cuerpo JSON cacheado (bytes)}`` para las
+    entradas ``(cache_key, task, arg)`` que estén en caché.
+    Cada clave se busca primero en la caché L1 del proceso; las que no
+    están se leen de Redis, junto con sus marcas de frescura, en una
+    sola ida (get_many = MGET) sea cual sea el número de claves.
+    Si un dato existe pero su marca ya caducó (refresh-ahead), lanza su
+    refresco en segundo plano y sirve igualmente el dato actual: la
+    siguiente petición encontrará el dato nuevo sin pasar por un MISS.
+    """
+    found = {}
+    pending = []
+    for cache_key, task, arg in entries:
+        cached_body = _local_cache.get(cache_key)
+        if cached_body is not None:
+            found[cache_key] = cached_body
+        else:
+            pending.append((cache_key, task, arg))
+    if not pending:
+        return found
+
+    values = cache.get_many([key for cache_key, _, _ in pending for key in (cache_key, fresh_key(cache_key))])
+    for cache_key, task, arg in pending:
+        cached_body = values.get(cache_key)
+        if cached_body is None:
+            continue
+        found[cache_key] = cached_body
+        _local_cache.set(cache_key, cached_body)
+        if fresh_key(cache_key) not in values:
+            logger.info("Dato a punto de caducar, refrescando en segundo plano: %s", cache_key)
+            try:
+                _launch_task_once(task, arg, cache_key)
+            except Exception:
+                # El dato sigue siendo válido: un fallo al encolar el refresco
+                # no debe convertir un HIT en un error
+                logger.exception("No se pudo lanzar el refresco de %s", cache_key)
+    return found
+
+
+def _get_cached(cache_key, task, arg):
+    """Devuelve el cuerpo JSON cacheado (bytes) para ``cache_key``, o None."""
+    return _get_cached_many([(cache_key, task, arg)]).get(cache_key)
+
+
+def _cached_json_response(request, cached_body):
+    """
+    Devuelve el cuerpo JSON cacheado sin volver a serializarlo.
+    El ETag es un hash del propio cuerpo: si el cliente ya tiene esa
+    versión (If-None-Match) se responde 304 sin cuerpo.
+    """
+    etag = f'"{hashlib.blake2b(cached_body, digest_size=16).hexdigest()}"'
+    response = HttpResponse(cached_body, content_type="application/json")
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, max_age=60)
+    return get_conditional_response(request, etag=etag, response=response)
+
+
+def _cached_or_enqueue(request, cache_key, task, arg):
+    """
+    Flujo común de las vistas de datos: sirve el dato de ``cache_key`` si
+    está en caché y, si no, lanza ``task(arg)`` (una sola vez por clave),
+    espera brevemente por si termina en línea y, si no, devuelve el
+    task_id para que el frontend vigile la tarea.
+    """
+    # 1. Intentar obtener datos del caché
+    cached_body = _get_cached(cache_key, task, arg)
+
+    if cached_body is not None:
+        # 2. ¡Cache HIT! Devolvemos los datos inmediatamente
+        logger.info("Cache HIT para %s: %s", cache_key, arg)
+        return _cached_json_response(request, cached_body)
+
+    # 3. ¡Cache MISS!
+    # ¡NO HACEMOS SCRAPING! La tarea se ejecuta en el worker; si ya hay
+    # una en curso para esta clave, reutilizamos su ID en lugar de encolar otra.
+    logger.info("Cache MISS para %s. Lanzando tarea Celery para: %s", cache_key, arg)
+    task_id = _launch_task_once(task, arg, cache_key)
+
+    # 4. Si la tarea termina enseguida, devolvemos ya los datos
+    result = _inline_result(task_id)
+    if result is not None:
+        response = JsonResponse({"status": "SUCCESS", "data": result})
+    else:
+        # 5. Devolvemos el ID de la tarea (el "ticket")
+        response = JsonResponse({"status": "PROCESSING", "task_id": task_id})
+    # Sin ETag ni caché: solo los HIT se sirven con _cached_json_response
+    add_never_cache_headers(response)
+    return response
+
+
+def _inline_result(task_id):
+    """
+    Espera brevemente a la tarea. Devuelve su resultado si ha terminado
+    con éxito en ese margen, o None para seguir por el camino PROCESSING.
+    """
+    task = AsyncResult(task_id)
+    with suppress(CeleryTimeoutError):
+        task.get(timeout=INLINE_RESULT_TIMEOUT, propagate=False, interval=0.05)
+        payload = _task_status_payload(task)
+        if payload["status"] == "SUCCESS":
+            return payload["data"]
+    return None
+
 
+def _task_id_error(task_id):
+    """
+    Devuelve una respuesta 400 si ``task_id`` falta o no tiene forma de
+    task_id, o None si es válido. Así una petición mal formada no llega
+    al backend de Celery.
+    """
+    if not task_id:
+        return JsonResponse(
+            {"status": "ERROR", "message": "No se proporcionó task_id"},
+            status=400,
+        )
+    if not _TASK_ID_RE.match(task_id):
+        return JsonResponse(
+            {"status": "ERROR", "message": "task_id no válido"},
+            status=400,
+        )
+    return None
+
+
+def _finished_task_status(task_id):
+    """Respuesta de estado ya guardada para una tarea terminada, o None."""
+    return cache.get(task_meta_key(task_id))
+
+
+def _meta_status_payload(meta):
+    """Traduce el dict de meta de una tarea de Celery a la respuesta que espera el frontend."""
+    state = meta["status"]
+    if state == "SUCCESS":
+        # ¡La tarea ha terminado!
+        return {
+            "status": "SUCCESS",
+            "data": meta.get("result"),  # Obtenemos el resultado (la lista de mp3_links)
+        }
+    if state == "FAILURE":
+        # La tarea ha fallado
+        return {
+            "status": "ERROR",
+            "message": "La tarea de scraping ha fallado.",
+        }
+    # La tarea sigue en 'PENDING' o 'STARTED'
+    return {
+        "status": "PROCESSING",
+        "message": f"Estado de la tarea: {state}",
+    }
+
+
+def _task_status_payload(task):
+    """
+    Devuelve la respuesta de estado de ``task``.
+    Estado y resultado salen del mismo dict de meta: una sola lectura del
+    backend (ninguna si AsyncResult.get() ya lo dejó cacheado), en lugar
+    de una por cada acceso a ``task.state`` y ``task.result``.
+    Los estados finales se guardan en caché para _finished_task_status y
+    la tarea se olvida en el backend: Redis libera su resultado en cuanto
+    alguien lo ha leído, sin esperar a CELERY_RESULT_EXPIRES. Las tareas
+    de un lote (BatchView) no se olvidan aquí: el GroupResult las necesita
+    para saber si el lote ha terminado; las olvida _group_status_payload.
+    """
+    meta = task._get_task_meta()  # noqa: SLF001
+    payload = _meta_status_payload(meta)
+    if payload["status"] != "PROCESSING":
+        cache.set(task_meta_key(task.id), payload, timeout=TASK_META_CACHE_TTL)
+        if not meta.get("group_id"):
+            task.forget()
+    return payload
+
+
+def _group_status_payload(group_result):
+    """
+    Equivalente a _task_status_payload para un grupo de tareas (BatchView).
+    Solo devuelve el progreso: los datos de cada tarea ya están en la
+    caché y el frontend los lee con BulkDataView.
+    Al terminar el lote se guarda en caché la respuesta del grupo y la de
+    cada tarea, antes de olvidarlas todas: quien siga una tarea suelta del
+    lote (su task_id se reparte por la reserva ``lock:``) la encuentra en
+    _finished_task_status.
+    """
+    ready = group_result.ready()
+    progress = {"completed": group_result.completed_count(), "total": len(group_result)}
+    if not ready:
+        return {"status": "PROCESSING", **progress}
+
+    if progress["completed"] == progress["total"]:
+        payload = {"status": "SUCCESS", **progress}
+    else:
+        payload = {"status": "ERROR", "message": "Alguna tarea de scraping ha fallado.", **progress}
+    payloads = {
+        task_meta_key(task.id): _meta_status_payload(task._get_task_meta())  # noqa: SLF001
+        for task in group_result.results
+    }
+    payloads[task_meta_key(group_result.id)] = payload
+    cache.set_many(payloads, timeout=TASK_META_CACHE_TTL)
+    group_result.forget()
+    return payload
+
+
+def _sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class JsonLoginRequiredMixin(LoginRequiredMixin):
+    """
+    LoginRequiredMixin para los endpoints que consume el JavaScript:
+    sin sesión responde un 401 en JSON en lugar de redirigir al login,
+    así el frontend no sigue la redirección ni se renderiza la plantilla.
+    """
+
+    def handle_no_permission(self):
+        return JsonResponse(
+            {"status": "ERROR", "message": "Autenticación requerida"},
+            status=401,
+        )
+
+
+@method_decorator(cache_control(private=True), name="dispatch")
 class SearchView(LoginRequiredMixin, TemplateView):
     """
     Página principal con el buscador.
@@ -32,60 +328,53 @@ class SearchView(LoginRequiredMixin, TemplateView):
             return context
 
         # 1. Definir claves
-        cache_key = f"search_view_{query.lower().replace(' ', '_')}"
-        task_cache_key = f"task_id_for_search_{query}"
+        cache_key = search_key(query)
+        task_cache_key = task_lock_key(cache_key)
 
         # 2. Intentar obtener datos del caché de Django
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            logger.info(f"Cache HIT para búsqueda: {query}")
-            context["podcasts"] = cached_data
+        cached_body = _get_cached(cache_key, search_podcast_task, query)
+        if cached_body is not None:
+            logger.info("Cache HIT para búsqueda: %s", query)
+            podcasts = json.loads(cached_body)["data"]
+            context["podcasts"] = podcasts
             # También obtenemos los IDs de los favoritos del usuario
-            context["user_favorites_ids"] = set(
-                FavoritePodcast.objects.filter(user=request.user).values_list("ivoox_id", flat=True),
-            )
+            context["user_favorites_ids"] = _user_favorite_ids(request.user, podcasts)
             return context
 
         # 3. ¡Cache MISS! Revisar si hay una tarea en curso
         task_id = cache.get(task_cache_key)
         if task_id:
-            task = AsyncResult(task_id)
-
-            if task.state == "SUCCESS":
-                # La tarea terminó, guardamos el resultado y lo mostramos
-                logger.info(f"Tarea {task_id} terminada. Obteniendo resultados.")
-                podcasts = task.result
+            # Mismo camino que TaskStatusView: si otra petición ya vio terminar
+            # la tarea (y la olvidó en el backend), su estado final está en caché.
+            # La reserva la libera la propia tarea (release_task_lock).
+            payload = _finished_task_status(task_id) or _task_status_payload(AsyncResult(task_id))
+
+            if payload["status"] == "SUCCESS":
+                # La tarea terminó, mostramos su resultado
+                logger.info("Tarea %s terminada. Obteniendo resultados.", task_id)
+                podcasts = payload["data"]
                 context["podcasts"] = podcasts
-                context["user_favorites_ids"] = set(
-                    FavoritePodcast.objects.filter(user=request.user).values_list("ivoox_id", flat=True),
-                )
-                cache.delete(task_cache_key)  # Limpiamos el ID de la tarea
+                context["user_favorites_ids"] = _user_favorite_ids(request.user, podcasts)
                 return context
 
-            if task.state in ("PENDING", "PROCESSING", "STARTED"):
+            if payload["status"] == "PROCESSING":
                 # La tarea sigue en curso. Informamos a la plantilla.
-                logger.info(f"Tarea {task_id} sigue en proceso...")
+                logger.info("Tarea %s sigue en proceso...", task_id)
                 context["task_id"] = task_id
                 return context
 
-            if task.state == "FAILURE":
-                logger.error(f"Tarea {task_id} falló.")
-                context["error_message"] = "La tarea de búsqueda falló en el servidor."
-                cache.delete(task_cache_key)  # Limpiamos la tarea fallida
-                return context
+            logger.error("Tarea %s falló.", task_id)
+            context["error_message"] = "La tarea de búsqueda falló en el servidor."
+            return context
 
         # 4. No hay caché Y no hay tarea en curso. Lanzamos una nueva.
-        logger.info(f"Cache MISS para búsqueda. Lanzando tarea Celery para: {query}")
-        task = search_podcast_task.delay(query)
-
-        # Guardamos el ID de la tarea en caché para la próxima recarga
-        cache.set(task_cache_key, task.id, timeout=600)  # 10 min
-
-        context["task_id"] = task.id  # Informamos a la plantilla
+        # El ID de la tarea queda en caché para la próxima recarga
+        logger.info("Cache MISS para búsqueda. Lanzando tarea Celery para: %s", query)
+        context["task_id"] = _launch_task_once(search_podcast_task, query, cache_key)  # Informamos a la plantilla
         return context
 
 
-class SearchDataView(LoginRequiredMixin, View):
+class SearchDataView(JsonLoginRequiredMixin, View):
     """
     API de AJAX: Revisa la caché de BÚSQUEDA y, si falla,
     LANZA UNA TAREA EN SEGUNDO PLANO.
@@ -99,26 +388,10 @@ class SearchDataView(LoginRequiredMixin, View):
                 status=400,
             )
 
-        # 1. Definir la clave de caché
-        cache_key = f"search_view_{query.lower().replace(' ', '_')}"
-
-        # 2. Intentar obtener datos del caché
-        cached_data = cache.get(cache_key)
-
-        if cached_data:
-            # 3. ¡Cache HIT! Devolvemos los datos inmediatamente
-            logger.info(f"Cache HIT para búsqueda: {query}")
-            return JsonResponse({"status": "SUCCESS", "data": cached_data})
-
-        # 4. ¡Cache MISS!
-        # Lanzamos la tarea de Celery en segundo plano.
-        logger.info(f"Cache MISS para búsqueda. Lanzando tarea Celery para: {query}")
-        task = search_podcast_task.delay(query)
-
-        # 5. Devolvemos el ID de la tarea (el "ticket")
-        return JsonResponse({"status": "PROCESSING", "task_id": task.id})
+        return _cached_or_enqueue(request, search_key(query), search_podcast_task, query)
 
 
+@method_decorator(cache_control(private=True), name="dispatch")
 class EpisodesView(LoginRequiredMixin, TemplateView):
     """
     Muestra la plantilla de episodios INMEDIATAMENTE.
@@ -136,10 +409,12 @@ class EpisodesView(LoginRequiredMixin, TemplateView):
         context = super().get_context_data(**kwargs)
         context["podcast_name"] = self.request.GET.get("name", "Podcast")
         context["podcast_url"] = self.request.GET.get("url")
+        # El frontend solo usa el stream SSE y re-pregunta enseguida si el servidor hace long polling
+        context["server_waits"] = bool(settings.TASK_STATUS_LONG_POLL_TIMEOUT)
         return context
 
 
-class EpisodeDataView(LoginRequiredMixin, View):
+class EpisodeDataView(JsonLoginRequiredMixin, View):
     """
     API de AJAX: Revisa la caché y, si falla,
     LANZA UNA TAREA EN SEGUNDO PLANO.
@@ -153,75 +428,213 @@ class EpisodeDataView(LoginRequiredMixin, View):
                 status=400,
             )
 
-        # 1. Definir la clave de caché
-        cache_key = f"episodes_view_{podcast_url}"
+        return _cached_or_enqueue(request, episodes_key(podcast_url), scrape_podcast_episodes_task, podcast_url)
 
-        # 2. Intentar obtener datos del caché
-        cached_data = cache.get(cache_key)
 
-        if cached_data:
-            # 3. ¡Cache HIT! Devolvemos los datos inmediatamente
-            logger.info(f"Cache HIT para episodios: {podcast_url}")
-            return JsonResponse({"status": "SUCCESS", "data": cached_data})
+@method_decorator(never_cache, name="dispatch")
+class BulkDataView(JsonLoginRequiredMixin, View):
+    """
+    API de AJAX: varias búsquedas (``?search=``) y listados de episodios
+    (``?url=``) en una sola petición, para páginas que necesitan más de uno.
+    Todas las claves se leen de Redis con un único get_many; para las que
+    faltan se lanza su tarea y se devuelve su task_id, sin esperar en línea.
+    """
 
-        # 4. ¡Cache MISS!
-        # ¡NO HACEMOS SCRAPING!
-        # Lanzamos la tarea de Celery en segundo plano.
-        logger.info(
-            f"Cache MISS para episodios. Lanzando tarea Celery para: {podcast_url}",
-        )
+    def get(self, request, *args, **kwargs):
+        queries = [query for query in request.GET.getlist("search") if query]
+        podcast_urls = [url for url in request.GET.getlist("url") if url]
+        if not queries and not podcast_urls:
+            return JsonResponse(
+                {"status": "ERROR", "message": "No se proporcionó 'search' ni 'url'"},
+                status=400,
+            )
+        if len(queries) + len(podcast_urls) > BULK_MAX_ITEMS:
+            return JsonResponse(
+                {"status": "ERROR", "message": f"Máximo {BULK_MAX_ITEMS} elementos por petición"},
+                status=400,
+            )
 
-        # .delay() ejecuta la tarea en el worker
-        task = scrape_podcast_episodes_task.delay(podcast_url)
+        # (nombre en la respuesta, valor pedido, clave de caché, tarea)
+        entries = [("search", query, search_key(query), search_podcast_task) for query in queries]
+        entries += [("episodes", url, episodes_key(url), scrape_podcast_episodes_task) for url in podcast_urls]
+        cached = _get_cached_many([(cache_key, task, arg) for _, arg, cache_key, task in entries])
 
-        # 5. Devolvemos el ID de la tarea (el "ticket")
-        return JsonResponse({"status": "PROCESSING", "task_id": task.id})
+        data = {"search": {}, "episodes": {}}
+        for name, arg, cache_key, task in entries:
+            cached_body = cached.get(cache_key)
+            if cached_body is not None:
+                data[name][arg] = json.loads(cached_body)
+            else:
+                data[name][arg] = {"status": "PROCESSING", "task_id": _launch_task_once(task, arg, cache_key)}
+        return JsonResponse({"status": "SUCCESS", "data": data})
 
 
-class TaskStatusView(LoginRequiredMixin, View):
+@method_decorator(never_cache, name="dispatch")
+class BatchView(JsonLoginRequiredMixin, View):
+    """
+    API de AJAX: lanza en un solo grupo de Celery las búsquedas (``search``)
+    y listados de episodios (``url``) enviados por POST.
+    Devuelve el id del grupo, que se vigila con TaskStatusView?group_id=
+    (una consulta para todo el lote en lugar de un poll por tarea); al
+    terminar, los datos se leen de la caché con BulkDataView.
+    Como _launch_task_once, no relanza lo que ya está en caché ni lo que
+    ya tiene una tarea en curso (de esas se devuelve su task_id): cada
+    tarea del grupo se lanza con la reserva ``lock:`` tomada a su nombre.
+    """
+
+    def post(self, request, *args, **kwargs):
+        # dict.fromkeys quita duplicados conservando el orden
+        queries = list(dict.fromkeys(query for query in request.POST.getlist("search") if query))
+        podcast_urls = list(dict.fromkeys(url for url in request.POST.getlist("url") if url))
+        if not queries and not podcast_urls:
+            return JsonResponse(
+                {"status": "ERROR", "message": "No se proporcionó 'search' ni 'url'"},
+                status=400,
+            )
+        if len(queries) + len(podcast_urls) > BULK_MAX_ITEMS:
+            return JsonResponse(
+                {"status": "ERROR", "message": f"Máximo {BULK_MAX_ITEMS} elementos por petición"},
+                status=400,
+            )
+
+        # (clave de caché, tarea, argumento); el dict quita las variantes de una misma clave
+        entries = {search_key(query): (search_podcast_task, query) for query in queries}
+        entries |= {episodes_key(url): (scrape_podcast_episodes_task, url) for url in podcast_urls}
+        cached = _get_cached_many([(cache_key, task, arg) for cache_key, (task, arg) in entries.items()])
+
+        signatures = []
+        lock_keys = []
+        running_task_ids = []
+        for cache_key, (task, arg) in entries.items():
+            if cache_key in cached:
+                continue
+            lock_key = task_lock_key(cache_key)
+            task_id = str(uuid.uuid4())
+            if cache.add(lock_key, task_id, timeout=TASK_LOCK_TTL):
+                signatures.append(task.si(arg).set(task_id=task_id))
+                lock_keys.append(lock_key)
+            elif running_task_id := cache.get(lock_key):
+                running_task_ids.append(running_task_id)
+
+        if not signatures:
+            # Todo está en caché o ya en curso: nada que lanzar
+            status = "PROCESSING" if running_task_ids else "SUCCESS"
+            return JsonResponse({"status": status, "group_id": None, "task_ids": running_task_ids})
+
+        try:
+            group_result = group(signatures).apply_async()
+            # GroupResult.restore() lo necesita guardado en el backend
+            group_result.save()
+        except Exception:
+            # Igual que en _launch_task_once: sin tareas encoladas, las reservas sobran
+            cache.delete_many(lock_keys)
+            raise
+        logger.info("Lote lanzado: %s (%s tareas)", group_result.id, len(group_result))
+        return JsonResponse({"status": "PROCESSING", "group_id": group_result.id, "task_ids": running_task_ids})
+
+
+# Sin ATOMIC_REQUESTS: la espera del long polling no debe retener una
+# conexión a Postgres "idle in transaction"
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+@method_decorator(never_cache, name="dispatch")
+class TaskStatusView(JsonLoginRequiredMixin, View):
     """
     ¡NUEVA VISTA!
     El frontend vigilará (poll) esta vista para saber
     cuándo ha terminado la tarea.
+    Si TASK_STATUS_LONG_POLL_TIMEOUT es mayor que 0 es un long polling:
+    la petición espera hasta esos segundos y responde en cuanto la tarea
+    termina, así cada consulta cubre todo ese intervalo en lugar de un
+    único instante. Con 0 responde al momento con el estado actual.
     """
 
     def get(self, request, *args, **kwargs):
-        task_id = request.GET.get("task_id")
-        if not task_id:
+        # Los lotes de BatchView se consultan con ?group_id= en lugar de ?task_id=
+        group_id = request.GET.get("group_id")
+        task_id = group_id or request.GET.get("task_id")
+        if error := _task_id_error(task_id):
+            return error
+
+        # Si ya vimos terminar la tarea, respondemos sin tocar el backend de Celery
+        if payload := _finished_task_status(task_id):
+            return JsonResponse(payload)
+
+        if group_id:
+            return self._group_status(group_id)
+
+        # Obtenemos el estado de la tarea desde el backend de Celery (Redis).
+        # AsyncResult.get() espera sobre el pub/sub del backend, no en bucle.
+        task = AsyncResult(task_id)
+        if timeout := settings.TASK_STATUS_LONG_POLL_TIMEOUT:
+            with suppress(CeleryTimeoutError):
+                task.get(timeout=timeout, propagate=False)
+        return JsonResponse(_task_status_payload(task))
+
+    def _group_status(self, group_id):
+        group_result = GroupResult.restore(group_id)
+        if group_result is None:
             return JsonResponse(
-                {"status": "ERROR", "message": "No se proporcionó task_id"},
-                status=400,
+                {"status": "ERROR", "message": "Lote no encontrado"},
+                status=404,
             )
+        # Igual que con una tarea suelta: esperamos a que termine todo el lote
+        if timeout := settings.TASK_STATUS_LONG_POLL_TIMEOUT:
+            with suppress(CeleryTimeoutError):
+                group_result.get(timeout=timeout, propagate=False)
+        return JsonResponse(_group_status_payload(group_result))
+
+
+# Igual que TaskStatusView: sin ATOMIC_REQUESTS mientras el stream espera
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+@method_decorator(never_cache, name="dispatch")
+class TaskStatusStreamView(JsonLoginRequiredMixin, View):
+    """
+    Versión Server-Sent Events de TaskStatusView.
+    En lugar de que el frontend pregunte cada pocos segundos, la conexión
+    queda abierta y se envía un evento 'done' en cuanto la tarea termina.
+    AsyncResult.get() espera sobre el pub/sub que el backend Redis de Celery
+    publica al guardar el resultado, así que no se consulta Redis en bucle.
+    Como el long polling de TaskStatusView, solo mantiene la conexión
+    abierta si TASK_STATUS_LONG_POLL_TIMEOUT lo permite (servidor con
+    hilos); con 0 envía el estado actual y cierra.
+    """
+
+    # Cada cuánto se envía un latido mientras la tarea sigue en curso
+    heartbeat_interval = 10
+    # Por debajo del timeout de gunicorn: al cerrarse, el cliente reconecta
+    stream_duration = 25
+
+    def get(self, request, *args, **kwargs):
+        task_id = request.GET.get("task_id")
+        if error := _task_id_error(task_id):
+            return error
+
+        response = StreamingHttpResponse(self._stream(task_id), content_type="text/event-stream")
+        # Evita que un proxy (nginx/traefik) acumule los eventos en buffer
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def _stream(self, task_id):
+        if payload := _finished_task_status(task_id):
+            yield _sse_event("done", payload)
+            return
 
-        # 1. Obtenemos el estado de la tarea desde el backend de Celery (Redis)
         task = AsyncResult(task_id)
+        stream_duration = self.stream_duration if settings.TASK_STATUS_LONG_POLL_TIMEOUT else 0
+        deadline = time.monotonic() + stream_duration
 
-        # 2. Comprobamos el estado
-        if task.state == "SUCCESS":
-            # ¡La tarea ha terminado!
-            return JsonResponse(
-                {
-                    "status": "SUCCESS",
-                    "data": task.result,  # Obtenemos el resultado (la lista de mp3_links)
-                },
-            )
-        if task.state == "FAILURE":
-            # La tarea ha fallado
-            return JsonResponse(
-                {
-                    "status": "ERROR",
-                    "message": "La tarea de scraping ha fallado.",
-                },
-            )
-        # La tarea sigue en 'PENDING' o 'STARTED'
-        return JsonResponse(
-            {
-                "status": "PROCESSING",
-                "message": f"Estado de la tarea: {task.state}",
-            },
-        )
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                task.get(timeout=min(self.heartbeat_interval, remaining), propagate=False)
+                break
+            except CeleryTimeoutError:
+                yield _sse_event("processing", {})
+
+        # Si la tarea no ha terminado, el payload es PROCESSING y el cliente reconecta
+        yield _sse_event("done", _task_status_payload(task))
 
 
+@method_decorator(cache_control(private=True), name="dispatch")
 class FavoriteListView(LoginRequiredMixin, ListView):
     """
     Muestra la lista de podcasts favoritos del usuario logueado.
@@ -230,10 +643,29 @@ class FavoriteListView(LoginRequiredMixin, ListView):
     model = FavoritePodcast
     template_name = "pages/favorites.html"
     context_object_name = "favorite_list"
+    paginate_by = 50
 
     def get_queryset(self):
-        # Filtra los favoritos solo para el usuario actual
-        return FavoritePodcast.objects.filter(user=self.request.user).order_by("-created_at")
+        # Filtra los favoritos solo para el usuario actual y trae solo
+        # las columnas que pinta la plantilla
+        return (
+            FavoritePodcast.objects.filter(user=self.request.user)
+            .only("name", "thumbnail_url", "ivoox_url", "ivoox_id", "created_at")
+            .order_by("-created_at")
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        # Al quitar el último favorito de la última página, ToggleFavoriteView
+        # vuelve a esa página, que ya no existe: get_page() lleva a la última
+        # válida en lugar de devolver un 404.
+        paginator = self.get_paginator(
+            queryset,
+            page_size,
+            orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        page = paginator.get_page(self.request.GET.get(self.page_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
 
 
 class ToggleFavoriteView(LoginRequiredMixin, View):
@@ -250,23 +682,31 @@ class ToggleFavoriteView(LoginRequiredMixin, View):
         if not ivoox_id:
             return HttpResponseBadRequest("Falta 'ivoox_id'")
 
-        # Intentamos encontrar el favorito
-        favorite, created = FavoritePodcast.objects.get_or_create(
-            user=request.user,
-            ivoox_id=ivoox_id,
-            defaults={
-                "name": data.get("name"),
-                "ivoox_url": data.get("ivoox_url"),
-                "thumbnail_url": data.get("thumbnail_url"),
-            },
-        )
+        # Intentamos borrar el favorito: un único DELETE nos dice si existía
+        # (la vista ya corre en una transacción por ATOMIC_REQUESTS)
+        deleted, _ = FavoritePodcast.objects.filter(user=request.user, ivoox_id=ivoox_id).delete()
 
-        if not created:
-            # Si no fue creado, ya existía. Lo borramos.
-            favorite.delete()
-            logger.info(f"Favorito eliminado: {data.get('name')}")
+        if deleted:
+            logger.info("Favorito eliminado: %s", data.get("name"))
         else:
-            logger.info(f"Favorito añadido: {favorite.name}")
+            # No existía: lo creamos. Si otra petición simultánea (doble clic)
+            # lo acaba de crear, el índice único salta y lo damos por añadido;
+            # cualquier otro error de integridad (p. ej. falta 'name') se
+            # propaga. El savepoint mantiene usable la transacción de la petición.
+            try:
+                with transaction.atomic():
+                    favorite = FavoritePodcast.objects.create(
+                        user=request.user,
+                        ivoox_id=ivoox_id,
+                        name=data.get("name"),
+                        ivoox_url=data.get("ivoox_url"),
+                        thumbnail_url=data.get("thumbnail_url"),
+                    )
+                logger.info("Favorito añadido: %s", favorite.name)
+            except IntegrityError:
+                if not FavoritePodcast.objects.filter(user=request.user, ivoox_id=ivoox_id).exists():
+                    raise
+                logger.info("Favorito ya existía: %s", data.get("name"))
 
         # MUY IMPORTANTE: Redirigimos al usuario a la página
         # exacta desde la que vino (ej. la página de búsqueda).